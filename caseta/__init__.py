@@ -1,4 +1,5 @@
 from . import casetify
+from . import levels
 import asyncio
 import weakref
 import logging
@@ -7,6 +8,9 @@ import os.path
 import json
 
 from homeassistant.const import (CONF_NAME, CONF_ID, CONF_DEVICES, CONF_HOST, CONF_TYPE)
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant import config as conf_util
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import discovery
 
@@ -16,8 +20,23 @@ DOMAIN = "caseta"
 
 CONF_BUTTONS = "buttons"
 CONF_BRIDGES = "bridges"
+CONF_WATCH = "watch"
 DEFAULT_TYPE = "dimmer"
 
+# keys of hass.data[DOMAIN]
+DATA_CONFIG = "config"
+DATA_BRIDGES = "bridges"
+DATA_HOSTS = "hosts"
+DATA_LOCK = "lock"
+DATA_WATCH = "watch"
+DATA_WATCHING = "watching"
+
+SERVICE_RELOAD = "reload"
+WATCH_INTERVAL = 10
+
+# platform loaded for each device type
+COMPONENTS = { "dimmer": "light", "switch": "switch", "remote": "sensor", "scene": "scene" }
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_BRIDGES): vol.All(cv.ensure_list, [
@@ -32,72 +51,249 @@ CONFIG_SCHEMA = vol.Schema({
                 ]),
             }
         ]),
+        vol.Optional(CONF_WATCH, default=False): cv.boolean,
     }),
 }, extra=vol.ALLOW_EXTRA)
 
+def _integration_file(hass, host):
+    return os.path.join(hass.config.config_dir, "caseta_" + host + ".json")
+
+def _load_devices(hass, bridge):
+    """Read integration report, caseta_HOST.json, patched with the configured devices"""
+    devices = []
+    fname = _integration_file(hass, bridge[CONF_HOST])
+    _LOGGER.debug("loading %s", fname)
+    with open(fname, encoding='utf-8') as conf_file:
+        integration = json.load(conf_file)
+        # print(integration)
+        if "LIPIdList" in integration:
+            # lights and switches are in Zones
+            if "Zones" in integration["LIPIdList"]:
+                for zone in integration["LIPIdList"]["Zones"]:
+                    # print(zone)
+                    devices.append({CONF_ID: zone["ID"],
+                                    CONF_NAME: zone["Name"],
+                                    CONF_TYPE: "dimmer"})
+            # remotes are in Devices, except ID 1 which is the bridge itself
+            # whose phantom buttons trigger scenes programmed in the app
+            if "Devices" in integration["LIPIdList"]:
+                for device in integration["LIPIdList"]["Devices"]:
+                    # print(device)
+                    if device["ID"] == 1 and "Buttons" in device:
+                        devices.append({CONF_ID: device["ID"],
+                                        CONF_NAME: device["Name"],
+                                        CONF_TYPE: "scene",
+                                        CONF_BUTTONS: [{CONF_ID: b["Number"],
+                                                        CONF_NAME: b.get("Name", "Button " + str(b["Number"]))}
+                                                       for b in device["Buttons"]]})
+                    elif device["ID"] != 1 and "Buttons" in device:
+                        devices.append({CONF_ID: device["ID"],
+                                        CONF_NAME: device["Name"],
+                                        CONF_TYPE: "remote",
+                                        CONF_BUTTONS: [b["Number"] for b in device["Buttons"]]})
+    # patch up integration with devices
+    if CONF_DEVICES in bridge:
+        for device in bridge[CONF_DEVICES]:
+            found = False
+            for existing in devices:
+                if device[CONF_ID] == existing[CONF_ID]:
+                    for k in device:
+                        existing[k] = device[k]
+                    found = True
+                    break
+            if not found:
+                devices.append(device)
+    _LOGGER.debug("patched %s", devices)
+    return devices
+
+def _sort_devices(devices):
+    """Sort devices based on device types"""
+    types = { "remote": [], "switch": [], "dimmer": [], "scene": [] }
+    for device in devices:
+        types[device["type"]].append(device)
+    return types
+
+@asyncio.coroutine
+def _async_reload(hass, bridges):
+    """Diff @bridges against the running platforms, keeping bridge connections and levels.
+
+    Returns False if the integration reports could not be loaded.
+    """
+    with (yield from hass.data[DOMAIN][DATA_LOCK]):
+        return (yield from _async_reload_locked(hass, bridges))
+
+@asyncio.coroutine
+def _async_reload_locked(hass, bridges):
+    data = hass.data[DOMAIN]
+    try:
+        tables = []
+        for bridge in bridges:
+            devices = yield from hass.loop.run_in_executor(None, _load_devices, hass, bridge)
+            tables.append((bridge[CONF_HOST], _sort_devices(devices)))
+    except (OSError, ValueError, KeyError) as exc:
+        _LOGGER.error("Not reloading caseta, failed to load integration report: %s", exc)
+        return False
+
+    hosts = []
+    for host, types in tables:
+        hosts.append(host)
+        instance = Caseta(host)
+        for t in types:
+            component = COMPONENTS[t]
+            if component in instance.platforms:
+                _LOGGER.debug("Reloading caseta %s for host %s", component, host)
+                yield from instance.platforms[component].reload(types[t])
+            elif component in instance.pending:
+                # still being set up, it takes the latest devices when it registers
+                _LOGGER.debug("Updating pending caseta %s for host %s", component, host)
+                instance.pending[component] = types[t]
+            else:
+                _LOGGER.debug("Loading caseta %s for host %s", component, host)
+                instance.pending[component] = types[t]
+                yield from discovery.async_load_platform(hass,
+                                                         component,
+                                                         DOMAIN,
+                                                         { CONF_HOST: host,
+                                                           CONF_DEVICES: types[t] },
+                                                         data[DATA_CONFIG])
+    # bridges no longer configured keep their connection but lose their entities
+    for host in data[DATA_HOSTS]:
+        if host not in hosts:
+            _LOGGER.debug("Unloading caseta devices for host %s", host)
+            instance = Caseta(host)
+            for component in instance.pending:
+                instance.pending[component] = []
+            for platform in instance.platforms.values():
+                yield from platform.reload([])
+    data[DATA_HOSTS] = hosts
+    data[DATA_BRIDGES] = bridges
+    return True
+
+def _mtimes(hass, bridges):
+    mtimes = {}
+    for bridge in bridges:
+        fname = _integration_file(hass, bridge[CONF_HOST])
+        mtimes[fname] = os.path.getmtime(fname) if os.path.exists(fname) else None
+    return mtimes
+
+@callback
+def _async_set_watch(hass, watch):
+    """Start or stop watching the integration reports"""
+    data = hass.data[DOMAIN]
+    data[DATA_WATCH] = watch
+    if watch and not data[DATA_WATCHING]:
+        data[DATA_WATCHING] = True
+        hass.loop.create_task(_async_watch(hass))
+
+@asyncio.coroutine
+def _async_watch(hass):
+    """Reload when an integration report changes, until watching is turned off"""
+    data = hass.data[DOMAIN]
+    mtimes = yield from hass.loop.run_in_executor(None, _mtimes, hass, data[DATA_BRIDGES])
+    while True:
+        yield from asyncio.sleep(WATCH_INTERVAL)
+        if not data[DATA_WATCH]:
+            _LOGGER.debug("Stopped watching caseta integration reports")
+            data[DATA_WATCHING] = False
+            return
+        current = yield from hass.loop.run_in_executor(None, _mtimes, hass, data[DATA_BRIDGES])
+        if current != mtimes:
+            _LOGGER.info("Integration report changed, reloading caseta")
+            # a failed reload is retried when the report is written again
+            mtimes = current
+            try:
+                yield from _async_reload(hass, data[DATA_BRIDGES])
+            except Exception:
+                _LOGGER.exception("Failed to reload caseta")
+
 def setup(hass, config):
-    # read integration report, caseta_HOST.json
+    # reloads from the service and the watcher must not interleave
+    hass.data[DOMAIN] = { DATA_CONFIG: config, DATA_HOSTS: [], DATA_BRIDGES: [],
+                          DATA_LOCK: asyncio.Lock(loop=hass.loop),
+                          DATA_WATCH: False, DATA_WATCHING: False }
     if CONF_BRIDGES in config[DOMAIN]:
         for bridge in config[DOMAIN][CONF_BRIDGES]:
-            devices = []
-            fname = os.path.join(hass.config.config_dir, "caseta_" + bridge[CONF_HOST] + ".json")
-            _LOGGER.debug("loading %s", fname)
-            with open(fname, encoding='utf-8') as conf_file:
-                integration = json.load(conf_file)
-                # print(integration)
-                if "LIPIdList" in integration:
-                    # lights and switches are in Zones
-                    if "Zones" in integration["LIPIdList"]:
-                        for zone in integration["LIPIdList"]["Zones"]:
-                            # print(zone)
-                            devices.append({CONF_ID: zone["ID"],
-                                            CONF_NAME: zone["Name"],
-                                            CONF_TYPE: "dimmer"})
-                    # remotes are in Devices, except ID 1 which is the bridge itself
-                    if "Devices" in integration["LIPIdList"]:
-                        for device in integration["LIPIdList"]["Devices"]:
-                            # print(device)
-                            if device["ID"] != 1 and "Buttons" in device:
-                                devices.append({CONF_ID: device["ID"],
-                                                CONF_NAME: device["Name"],
-                                                CONF_TYPE: "remote",
-                                                CONF_BUTTONS: [b["Number"] for b in device["Buttons"]]})
-            # patch up integration with devices
-            if CONF_DEVICES in bridge:
-                for device in bridge[CONF_DEVICES]:
-                    found = False
-                    for existing in devices:
-                        if device[CONF_ID] == existing[CONF_ID]:
-                            for k in device:
-                                existing[k] = device[k]
-                            found = True
-                            break
-                    if not found:
-                        devices.append(device)
-            _LOGGER.debug("patched %s", devices)
-
-            # sort devices based on device types
-            types = { "remote": [], "switch": [], "dimmer": [] }
-            for device in devices:
-                types[device["type"]].append(device)
+            types = _sort_devices(_load_devices(hass, bridge))
             # print(types)
 
             # run discovery per type
             for t in types:
-                component = t
-                if component == "dimmer":
-                    component = "light"
-                if component == "remote":
-                    component = "sensor"
+                Caseta(bridge[CONF_HOST]).pending[COMPONENTS[t]] = types[t]
                 discovery.load_platform(hass,
-                                        component,
+                                        COMPONENTS[t],
                                         DOMAIN,
                                         { CONF_HOST: bridge[CONF_HOST],
                                           CONF_DEVICES: types[t] },
                                         config)
+            hass.data[DOMAIN][DATA_HOSTS].append(bridge[CONF_HOST])
+        hass.data[DOMAIN][DATA_BRIDGES] = config[DOMAIN][CONF_BRIDGES]
+
+    @asyncio.coroutine
+    def async_reload_service(service):
+        """Re-read the caseta configuration and integration reports"""
+        try:
+            conf = yield from conf_util.async_hass_config_yaml(hass)
+            conf = CONFIG_SCHEMA(conf)
+        except (HomeAssistantError, vol.Invalid) as exc:
+            _LOGGER.error("Not reloading caseta, invalid configuration: %s", exc)
+            return
+        if DOMAIN not in conf:
+            # caseta was removed from the configuration, unload every bridge
+            _async_set_watch(hass, False)
+            yield from _async_reload(hass, [])
+            return
+        yield from _async_reload(hass, conf[DOMAIN][CONF_BRIDGES])
+        _async_set_watch(hass, conf[DOMAIN][CONF_WATCH])
+
+    hass.services.register(DOMAIN, SERVICE_RELOAD, async_reload_service)
+
+    hass.add_job(_async_set_watch, hass, config[DOMAIN][CONF_WATCH])
 
     return True
 
+@asyncio.coroutine
+def async_reload_devices(data, configs, key, create):
+    """Update the entities of a platform to match @configs.
+
+    Existing entities are reconfigured in place. HA has no way to unregister
+    an entity from its platform, so removed entities only lose their state
+    and are parked in data._removed, to be revived with the same entity_id
+    if their device comes back. Entities not handed to HA yet, before the
+    platform's start(), are updated or dropped without touching HA. Returns
+    the created entities, which the platform still has to add.
+    """
+    current = {}
+    for device in data.devices:
+        current[key(device._config)] = device
+    devices = []
+    added = []
+    for config in configs:
+        k = key(config)
+        device = current.pop(k, None)
+        if device == None and k in data._removed:
+            _LOGGER.debug("Restoring caseta device %s", config.get(CONF_NAME))
+            device = data._removed.pop(k)
+            device._configure(config)
+            if device.hass != None:
+                yield from device.async_update_ha_state()
+        elif device == None:
+            device = create(config)
+            added.append(device)
+        elif device._config != config:
+            _LOGGER.debug("Updating caseta device %s to %s", device.name, config)
+            device._configure(config)
+            if device.hass != None:
+                yield from device.async_update_ha_state()
+        devices.append(device)
+    for k, device in current.items():
+        _LOGGER.debug("Removing caseta device %s", device.name)
+        if data._started:
+            data._removed[k] = device
+        if device.hass != None:
+            yield from device.async_remove()
+    data.setDevices(devices)
+    return added
+
 class Caseta:
     class __Callback(object):
         def __init__(self, callback):
@@ -127,6 +323,10 @@ class Caseta:
             self._casetify = None
             self._hass = None
             self._callbacks = []
+            self._levels = levels.Levels()
+            self._platforms = {}
+            # devices of platforms loaded but not registered yet
+            self._pending = {}
 
         def __str__(self):
             return repr(self) + self._host
@@ -140,6 +340,12 @@ class Caseta:
                 self._hass.loop.create_task(self._readNext())
                 return
             _LOGGER.debug("Read caseta for host %s: %s %d %d %f", self._host, mode, integration, action, value)
+            # drop levels the bridge is just repeating
+            if mode == Caseta.OUTPUT and action == Caseta.Action.SET:
+                if not self._levels.set(mode, integration, value):
+                    _LOGGER.debug("Unchanged level for host %s: %d %f", self._host, integration, value)
+                    self._hass.loop.create_task(self._readNext())
+                    return
             # walk callbacks
             for callback in self._callbacks:
                 _LOGGER.debug("Invoking callback for host %s", self._host)
@@ -179,6 +385,11 @@ class Caseta:
         def register(self, callback):
             self._callbacks.append(Caseta.__Callback(callback))
 
+        def register_platform(self, component, data, devices):
+            """Register @data for reloads, return its latest @devices"""
+            self._platforms[component] = data
+            return self._pending.pop(component, devices)
+
         def start(self, hass):
             _LOGGER.debug("Starting caseta for host %s", self._host)
             if self._hass == None:
@@ -190,6 +401,18 @@ class Caseta:
         def host(self):
             return self._host
 
+        @property
+        def levels(self):
+            return self._levels
+
+        @property
+        def platforms(self):
+            return self._platforms
+
+        @property
+        def pending(self):
+            return self._pending
+
     OUTPUT = casetify.Casetify.OUTPUT
     DEVICE = casetify.Casetify.DEVICE
 
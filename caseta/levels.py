@@ -0,0 +1,29 @@
+import math
+from array import array
+
+UNKNOWN = float("nan")
+
+class Levels:
+    """Last known values reported by a bridge, indexed by integration ID"""
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, mode, integration, default=None):
+        values = self._values.get(mode)
+        if values == None or integration >= len(values) or math.isnan(values[integration]):
+            return default
+        return values[integration]
+
+    def set(self, mode, integration, value):
+        """Store @value, return False if it matches the stored value"""
+        values = self._values.get(mode)
+        if values == None:
+            values = array("d")
+            self._values[mode] = values
+        if integration >= len(values):
+            values.extend([UNKNOWN] * (integration + 1 - len(values)))
+        elif values[integration] == value:
+            return False
+        values[integration] = value
+        return True
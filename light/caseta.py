@@ -20,9 +20,13 @@ DEFAULT_TYPE = "dimmer"
 _LOGGER = logging.getLogger(__name__)
 
 class CasetaData:
-    def __init__(self, caseta):
+    def __init__(self, caseta, async_add_devices):
         self._caseta = caseta
+        self._async_add_devices = async_add_devices
         self._devices = []
+        # entities dropped by a reload, revived if they come back
+        self._removed = {}
+        self._started = False
 
     @property
     def devices(self):
@@ -35,6 +39,21 @@ class CasetaData:
     def setDevices(self, devices):
         self._devices = devices
 
+    def start(self):
+        """Hand the devices to HA once the bridge is connected."""
+        self._started = True
+        self._async_add_devices(self._devices)
+
+    @asyncio.coroutine
+    def reload(self, configs):
+        devices = yield from caseta.async_reload_devices(self, configs, lambda light: light[CONF_ID],
+                                                         lambda light: CasetaLight(light, self))
+        # before start() the new devices are added and queried by setup
+        if self._started:
+            self._async_add_devices(devices)
+            for device in devices:
+                yield from device.query()
+
     @asyncio.coroutine
     def readOutput(self, mode, integration, action, value):
         # find integration in devices
@@ -42,9 +61,11 @@ class CasetaData:
             _LOGGER.debug("Got light caseta value: %s %d %d %f", mode, integration, action, value)
             for device in self._devices:
                 if device.integration == integration:
+                    # not added to HA yet, its state is written from the levels when it is
+                    if device.hass == None:
+                        break
                     if action == caseta.Caseta.Action.SET:
                         _LOGGER.info("Found light device, updating value")
-                        device._update_state(value)
                         yield from device.async_update_ha_state()
                         break
 
@@ -53,18 +74,18 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
     if discovery_info == None:
         return
     bridge = caseta.Caseta(discovery_info[CONF_HOST])
+    data = CasetaData(bridge, async_add_devices)
+    # register before connecting, so a reload meanwhile updates these devices
+    configs = bridge.register_platform("light", data, discovery_info[CONF_DEVICES])
+    data.setDevices([CasetaLight(light, data) for light in configs])
     yield from bridge.open()
 
-    data = CasetaData(bridge)
-    devices = [CasetaLight(light, data) for light in discovery_info[CONF_DEVICES]]
-    data.setDevices(devices)
+    bridge.register(data.readOutput)
+    data.start()
 
-    for device in devices:
+    for device in data.devices:
         yield from device.query()
 
-    async_add_devices(devices)
-
-    bridge.register(data.readOutput)
     bridge.start(hass)
 
     return True
@@ -75,11 +96,14 @@ class CasetaLight(Light):
     def __init__(self, light, data):
         """Initialize a Caseta Light."""
         self._data = data
-        self._name = light["name"]
         self._integration = int(light["id"])
+        self._configure(light)
+
+    def _configure(self, light):
+        """Apply the (re)loaded device config."""
+        self._config = light
+        self._name = light["name"]
         self._is_dimmer = light["type"] == "dimmer"
-        self._is_on = False
-        self._brightness = 0
 
     @asyncio.coroutine
     def query(self):
@@ -94,15 +118,22 @@ class CasetaLight(Light):
         """Return the display name of this light."""
         return self._name
 
+    @property
+    def should_poll(self):
+        """No polling needed, the bridge reports changes."""
+        return False
+
     @property
     def brightness(self):
         """Brightness of the light (an integer in the range 1-255)."""
-        return (self._brightness / 100) * 255
+        if not self._is_dimmer:
+            return 0
+        return (self._level / 100) * 255
 
     @property
     def is_on(self):
         """Return true if light is on."""
-        return self._is_on
+        return self._level > 0
 
     @property
     def supported_features(self):
@@ -111,6 +142,9 @@ class CasetaLight(Light):
 
     def async_turn_on(self, **kwargs):
         """Instruct the light to turn on."""
+        if self not in self._data.devices:
+            # removed by a reload, HA still knows the entity
+            return
         value = 100
         transition = None
         if self._is_dimmer:
@@ -123,6 +157,9 @@ class CasetaLight(Light):
 
     def async_turn_off(self, **kwargs):
         """Instruct the light to turn off."""
+        if self not in self._data.devices:
+            # removed by a reload, HA still knows the entity
+            return
         transition = None
         if self._is_dimmer:
             if ATTR_TRANSITION in kwargs:
@@ -130,8 +167,7 @@ class CasetaLight(Light):
         _LOGGER.debug("Writing caseta value: %d %d off %s", self._integration, caseta.Caseta.Action.SET, str(transition))
         yield from self._data.caseta.write(caseta.Caseta.OUTPUT, self._integration, caseta.Caseta.Action.SET, 0, transition)
 
-    def _update_state(self, brightness):
-        """Update brightness value."""
-        if self._is_dimmer:
-            self._brightness = brightness
-        self._is_on = brightness > 0
+    @property
+    def _level(self):
+        """Last level reported by the bridge."""
+        return self._data.caseta.levels.get(caseta.Caseta.OUTPUT, self._integration, 0)
@@ -0,0 +1,110 @@
+"""
+Platform for Caseta scenes.
+
+For more details about this platform, please refer to the documentation
+https://home-assistant.io/components/scene.caseta/
+"""
+from homeassistant.components.scene import Scene
+from homeassistant.const import (CONF_NAME, CONF_ID, CONF_DEVICES, CONF_HOST)
+
+from custom_components import caseta
+
+import asyncio
+import logging
+
+CONF_BUTTON = "button"
+
+_LOGGER = logging.getLogger(__name__)
+
+def _scenes(devices):
+    """One scene per phantom button of the bridge."""
+    return [{CONF_ID: device[CONF_ID], CONF_BUTTON: button[CONF_ID], CONF_NAME: button[CONF_NAME]}
+            for device in devices
+            for button in device[caseta.CONF_BUTTONS]]
+
+class CasetaData:
+    def __init__(self, caseta, async_add_devices):
+        self._caseta = caseta
+        self._async_add_devices = async_add_devices
+        self._devices = []
+        # entities dropped by a reload, revived if they come back
+        self._removed = {}
+        self._started = False
+
+    @property
+    def devices(self):
+        return self._devices
+
+    @property
+    def caseta(self):
+        return self._caseta
+
+    def setDevices(self, devices):
+        self._devices = devices
+
+    def start(self):
+        """Hand the devices to HA once the bridge is connected."""
+        self._started = True
+        self._async_add_devices(self._devices)
+
+    @asyncio.coroutine
+    def reload(self, configs):
+        devices = yield from caseta.async_reload_devices(self, _scenes(configs), lambda scene: scene[CONF_BUTTON],
+                                                         lambda scene: CasetaScene(scene, self))
+        # before start() the new devices are added by setup
+        if self._started:
+            self._async_add_devices(devices)
+
+def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
+    """Setup the platform."""
+    if discovery_info == None:
+        return
+    bridge = caseta.Caseta(discovery_info[CONF_HOST])
+    data = CasetaData(bridge, async_add_devices)
+    # register before connecting, so a reload meanwhile updates these devices
+    configs = bridge.register_platform("scene", data, discovery_info[CONF_DEVICES])
+    data.setDevices([CasetaScene(scene, data) for scene in _scenes(configs)])
+    yield from bridge.open()
+
+    data.start()
+
+    bridge.start(hass)
+
+    return True
+
+class CasetaScene(Scene):
+    """Representation of a Caseta bridge phantom button."""
+
+    def __init__(self, scene, data):
+        """Initialize a Caseta Scene."""
+        self._data = data
+        self._configure(scene)
+
+    def _configure(self, scene):
+        """Apply the (re)loaded scene config."""
+        self._config = scene
+        self._name = scene[CONF_NAME]
+        self._integration = int(scene[CONF_ID])
+        self._button = int(scene[CONF_BUTTON])
+
+    @property
+    def integration(self):
+        return self._integration
+
+    @property
+    def button(self):
+        return self._button
+
+    @property
+    def name(self):
+        """Return the display name of this scene."""
+        return self._name
+
+    @asyncio.coroutine
+    def async_activate(self):
+        """Press the phantom button, the bridge runs the scene."""
+        if self not in self._data.devices:
+            # removed by a reload, HA still knows the entity
+            return
+        _LOGGER.debug("Writing caseta scene: %d %d %d", self._integration, self._button, caseta.Caseta.Button.DOWN)
+        yield from self._data.caseta.write(caseta.Caseta.DEVICE, self._integration, self._button, caseta.Caseta.Button.DOWN)
@@ -17,10 +17,14 @@ import logging
 _LOGGER = logging.getLogger(__name__)
 
 class CasetaData:
-    def __init__(self, caseta, hass):
+    def __init__(self, caseta, hass, async_add_devices):
         self._caseta = caseta
         self._hass = hass
+        self._async_add_devices = async_add_devices
         self._devices = []
+        # entities dropped by a reload, revived if they come back
+        self._removed = {}
+        self._started = False
         self._added = {}
         self._later = None
 
@@ -35,6 +39,19 @@ class CasetaData:
     def setDevices(self, devices):
         self._devices = devices
 
+    def start(self):
+        """Hand the devices to HA once the bridge is connected."""
+        self._started = True
+        self._async_add_devices(self._devices)
+
+    @asyncio.coroutine
+    def reload(self, configs):
+        devices = yield from caseta.async_reload_devices(self, configs, lambda pico: pico[CONF_ID],
+                                                         lambda pico: CasetaPicoRemote(pico, self))
+        # before start() the new devices are added by setup
+        if self._started:
+            self._async_add_devices(devices)
+
     @asyncio.coroutine
     def _checkAdded(self):
         yield from asyncio.sleep(15)
@@ -43,8 +60,8 @@ class CasetaData:
             _LOGGER.debug("Removing caseta added %d %d", integration, self._added[integration])
             for device in self._devices:
                 if device.integration == integration:
-                    device._update_state(device.state & ~self._added[integration])
-                    yield from device.async_update_ha_state()
+                    if device._update_state(device.state & ~self._added[integration]):
+                        yield from device.async_update_ha_state()
                     _LOGGER.debug("Removed caseta added %d %d", integration, self._added[integration])
                     break
         self._added.clear()
@@ -56,11 +73,14 @@ class CasetaData:
             _LOGGER.debug("Got sensor caseta value: %s %d %d %f", mode, integration, action, value)
             for device in self._devices:
                 if device.integration == integration:
+                    # not added to HA yet
+                    if device.hass == None:
+                        break
                     state = 1 << action - device.minbutton
                     _LOGGER.debug("Found device, updating value")
                     if value == caseta.Caseta.Button.DOWN:
                         _LOGGER.info("Found sensor device, updating value, down")
-                        device._update_state(device.state | state)
+                        changed = device._update_state(device.state | state)
                         if integration in self._added:
                             self._added[integration] |= state
                         else:
@@ -69,13 +89,15 @@ class CasetaData:
                             self._later.cancel()
                         _LOGGER.debug("scheduling call later")
                         self._later = self._hass.loop.create_task(self._checkAdded())
-                        yield from device.async_update_ha_state()
+                        if changed:
+                            yield from device.async_update_ha_state()
                     elif value == caseta.Caseta.Button.UP:
                         _LOGGER.info("Found sensor device, updating value, up")
-                        device._update_state(device.state & ~state)
+                        changed = device._update_state(device.state & ~state)
                         if integration in self._added:
                             self._added[integration] &= ~state
-                        yield from device.async_update_ha_state()
+                        if changed:
+                            yield from device.async_update_ha_state()
                     break
 
 def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
@@ -83,15 +105,15 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
     if discovery_info == None:
         return
     bridge = caseta.Caseta(discovery_info[CONF_HOST])
+    data = CasetaData(bridge, hass, async_add_devices)
+    # register before connecting, so a reload meanwhile updates these devices
+    configs = bridge.register_platform("sensor", data, discovery_info[CONF_DEVICES])
+    data.setDevices([CasetaPicoRemote(pico, data) for pico in configs])
     yield from bridge.open()
 
-    data = CasetaData(bridge, hass)
-    devices = [CasetaPicoRemote(pico, data) for pico in discovery_info[CONF_DEVICES]]
-    data.setDevices(devices)
-
-    async_add_devices(devices)
-
     bridge.register(data.readOutput)
+    data.start()
+
     bridge.start(hass)
 
     return True
@@ -102,14 +124,18 @@ class CasetaPicoRemote(Entity):
     def __init__(self, pico, data):
         """Initialize a Caseta Pico."""
         self._data = data
-        self._name = pico['name']
         self._integration = int(pico['id'])
+        self._configure(pico)
+
+    def _configure(self, pico):
+        """Apply the (re)loaded device config."""
+        self._config = pico
+        self._name = pico['name']
         self._buttons = pico['buttons']
         self._minbutton = 100
         for b in self._buttons:
             if b < self._minbutton:
                 self._minbutton = b
-        self._state = 0
 
     @property
     def integration(self):
@@ -120,6 +146,11 @@ class CasetaPicoRemote(Entity):
         """Return the display name of this pico."""
         return self._name
 
+    @property
+    def should_poll(self):
+        """No polling needed, the bridge reports changes."""
+        return False
+
     @property
     def minbutton(self):
         return self._minbutton
@@ -127,8 +158,8 @@ class CasetaPicoRemote(Entity):
     @property
     def state(self):
         """State of the pico device."""
-        return self._state
+        return int(self._data.caseta.levels.get(caseta.Caseta.DEVICE, self._integration, 0))
 
     def _update_state(self, state):
-        """Update state."""
-        self._state = state
+        """Update state, return True if it changed."""
+        return self._data.caseta.levels.set(caseta.Caseta.DEVICE, self._integration, state)
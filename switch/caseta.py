@@ -17,9 +17,13 @@ import logging
 _LOGGER = logging.getLogger(__name__)
 
 class CasetaData:
-    def __init__(self, caseta):
+    def __init__(self, caseta, async_add_devices):
         self._caseta = caseta
+        self._async_add_devices = async_add_devices
         self._devices = []
+        # entities dropped by a reload, revived if they come back
+        self._removed = {}
+        self._started = False
 
     @property
     def devices(self):
@@ -32,6 +36,21 @@ class CasetaData:
     def setDevices(self, devices):
         self._devices = devices
 
+    def start(self):
+        """Hand the devices to HA once the bridge is connected."""
+        self._started = True
+        self._async_add_devices(self._devices)
+
+    @asyncio.coroutine
+    def reload(self, configs):
+        devices = yield from caseta.async_reload_devices(self, configs, lambda switch: switch[CONF_ID],
+                                                         lambda switch: CasetaSwitch(switch, self))
+        # before start() the new devices are added and queried by setup
+        if self._started:
+            self._async_add_devices(devices)
+            for device in devices:
+                yield from device.query()
+
     @asyncio.coroutine
     def readOutput(self, mode, integration, action, value):
         # find integration in devices
@@ -39,9 +58,11 @@ class CasetaData:
             _LOGGER.debug("Got switch caseta value: %s %d %d %f", mode, integration, action, value)
             for device in self._devices:
                 if device.integration == integration:
+                    # not added to HA yet, its state is written from the levels when it is
+                    if device.hass == None:
+                        break
                     if action == caseta.Caseta.Action.SET:
                         _LOGGER.info("Found switch device, updating value")
-                        device._update_state(value)
                         yield from device.async_update_ha_state()
                         break
 
@@ -50,18 +71,18 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
     if discovery_info == None:
         return
     bridge = caseta.Caseta(discovery_info[CONF_HOST])
+    data = CasetaData(bridge, async_add_devices)
+    # register before connecting, so a reload meanwhile updates these devices
+    configs = bridge.register_platform("switch", data, discovery_info[CONF_DEVICES])
+    data.setDevices([CasetaSwitch(switch, data) for switch in configs])
     yield from bridge.open()
 
-    data = CasetaData(bridge)
-    devices = [CasetaSwitch(switch, data) for switch in discovery_info[CONF_DEVICES]]
-    data.setDevices(devices)
+    bridge.register(data.readOutput)
+    data.start()
 
-    for device in devices:
+    for device in data.devices:
         yield from device.query()
 
-    async_add_devices(devices)
-
-    bridge.register(data.readOutput)
     bridge.start(hass)
 
     return True
@@ -72,13 +93,17 @@ class CasetaSwitch(SwitchDevice):
     def __init__(self, switch, data):
         """Initialize a Caseta Switch."""
         self._data = data
-        self._name = switch['name']
         self._integration = int(switch['id'])
-        self._is_on = False
+        self._configure(switch)
+
+    def _configure(self, switch):
+        """Apply the (re)loaded device config."""
+        self._config = switch
+        self._name = switch['name']
 
     @asyncio.coroutine
     def query(self):
-        self._data.caseta.query(caseta.Caseta.OUTPUT, self._integration, caseta.Caseta.Action.SET)
+        yield from self._data.caseta.query(caseta.Caseta.OUTPUT, self._integration, caseta.Caseta.Action.SET)
 
     @property
     def integration(self):
@@ -89,23 +114,30 @@ class CasetaSwitch(SwitchDevice):
         """Return the display name of this switch."""
         return self._name
 
+    @property
+    def should_poll(self):
+        """No polling needed, the bridge reports changes."""
+        return False
+
     @property
     def is_on(self):
         """Return true if switch is on."""
-        return self._is_on
+        return self._data.caseta.levels.get(caseta.Caseta.OUTPUT, self._integration, 0) > 0
 
     @asyncio.coroutine
     def async_turn_on(self, **kwargs):
         """Instruct the switch to turn on."""
+        if self not in self._data.devices:
+            # removed by a reload, HA still knows the entity
+            return
         _LOGGER.debug("Writing caseta value: %d %d on", self._integration, caseta.Caseta.Action.SET)
         yield from self._data.caseta.write(caseta.Caseta.OUTPUT, self._integration, caseta.Caseta.Action.SET, 100)
 
     @asyncio.coroutine
     def async_turn_off(self, **kwargs):
         """Instruct the swtich to turn off."""
+        if self not in self._data.devices:
+            # removed by a reload, HA still knows the entity
+            return
         _LOGGER.debug("Writing caseta value: %d %d off", self._integration, caseta.Caseta.Action.SET)
         yield from self._data.caseta.write(caseta.Caseta.OUTPUT, self._integration, caseta.Caseta.Action.SET, 0)
-
-    def _update_state(self, value):
-        """Update state."""
-        self._is_on = value > 0